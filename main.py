@@ -1,13 +1,25 @@
 from utils.youtube_helper import YouTubeHelper
 from utils.text_processor import TextProcessor
-from utils.mindmap_generator import MindMapGenerator
-from utils.pdf_generator import PDFGenerator
 from utils.notion_helper import NotionHelper
+from utils.html_templates import (APP_INTRO_HTML, PROCESS_STEP_HTML,
+                                  STEP_HEADER_HTML, POINT_CARD_TEMPLATE,
+                                  SUPPLEMENTARY_TEMPLATE, KEYWORD_CARD_TEMPLATE,
+                                  RELATED_TERMS_TEMPLATE, QUALITY_SECTION_TEMPLATE,
+                                  SCORE_ITEM_TEMPLATE, SCORE_INDICATORS,
+                                  PROGRESS_MESSAGE_TEMPLATE, VIDEO_CARD_TEMPLATE,
+                                  importance_tier)
 import streamlit as st
 import os
-import time
 import logging
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+try:
+    # Optional: orjson decodes several times faster than the stdlib parser
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 from datetime import datetime, timezone, timedelta
 
 # Set up logging
@@ -20,587 +32,683 @@ logger = logging.getLogger(__name__)
 # Import streamlit_mermaid at the top level
 from streamlit_mermaid import st_mermaid
 
-try:
-    # Page configuration
-    st.set_page_config(page_title="YouTube InsightMap",
-                       page_icon="🎯",
-                       layout="wide",
-                       initial_sidebar_state="collapsed")
-
-    # Load CSS
-    def load_css():
-        try:
-            css_path = os.path.join(os.path.dirname(__file__), 'styles',
-                                    'custom.css')
-            if os.path.exists(css_path):
-                with open(css_path) as f:
-                    st.markdown(f'<style>{f.read()}</style>',
-                               unsafe_allow_html=True)
-            else:
-                logger.error("CSS file not found!")
-        except Exception as e:
-            logger.error(f"Error loading CSS: {str(e)}")
-
-    load_css()
-
-    # サイドバーの設定
-    def setup_sidebar():
-        with st.sidebar:
-            st.markdown("## 🔍 保存済みデータ検索")
-            search_query = st.text_input("検索", placeholder="タイトルまたはチャンネル名で検索")
-            sort_by = st.selectbox(
-                "並び替え",
-                options=["analysis_date", "view_count"],
-                format_func=lambda x: {
-                    "analysis_date": "分析日時",
-                    "view_count": "視聴回数"
-                }[x]
-            )
-            sort_order = st.radio(
-                "並び順",
-                options=["descending", "ascending"],
-                format_func=lambda x: "降順" if x == "descending" else "昇順",
-                horizontal=True
-            )
-            return search_query, sort_by, sort_order
-
-    # データ一覧の表示
-    def display_saved_data(notion_helper, search_query, sort_by, ascending):
-        try:
-            success, pages = notion_helper.get_video_pages(
-                search_query=search_query,
-                sort_by=sort_by,
-                ascending=ascending
-            )
-            
-            if success:
-                data_count = len(pages) if pages else 0
-                with st.expander(f"📚 保存済み分析データ ({data_count}件)", expanded=True):
-                    if pages:
-                        for page in pages:
-                            st.markdown(f"""
-                            <div class="video-card glass-container">
-                                <div class="video-card-header">
-                                    <h3 class="video-title">🎥 {page['title']}</h3>
-                                </div>
-                                <div class="video-card-content">
-                                    <div class="video-info-grid">
-                                        <div class="info-section">
-                                            <div class="info-item">
-                                                <span class="info-label">📺 チャンネル</span>
-                                                <span class="info-value">{page['channel']}</span>
-                                            </div>
-                                            <div class="info-item">
-                                                <span class="info-label">📅 分析日時</span>
-                                                <span class="info-value">{datetime.fromisoformat(page['analysis_date'].replace('Z', '+00:00')).astimezone(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S (JST)')}</span>
-                                            </div>
+# Bit flags for st.session_state.steps_completed
+STEP_BITS = {
+    'video_info': 1,
+    'transcript': 2,
+    'summary': 4,
+    'mindmap': 8,
+    'proofread': 16,
+    'pdf': 32
+}
+
+# Session state defaults. main.py is re-executed on every rerun, so the
+# mutable values below are fresh objects for each run
+SESSION_DEFAULTS = {
+    'current_step': 1,
+    'steps_completed': 0,  # Bitmask of STEP_BITS
+    'video_info': None,
+    'transcript': None,
+    'transcript_hash': None,
+    'summary': None,
+    'summary_data': None,  # summary parsed once, for display
+    'quality_scores': None,
+    'mindmap': None,
+    'mindmap_svg': None,
+    'pdf_data': None,
+    'enhanced_text': None,
+    'proofread_chunks': None,  # Chunks streamed so far by the proofread job
+    'enhancement_progress': {
+        'progress': 0.0,
+        'message': ''
+    },
+    'current_summary_style': "overview",  # Default to overview
+    'youtube_url': None,
+    'jobs': {},  # Background job name -> Future
+    'job_cancel': threading.Event()  # Set by cancel_all_jobs
+}
+
+# Results that belong to the current video and are reset when it changes
+VIDEO_RESULT_KEYS = (
+    'steps_completed', 'transcript', 'transcript_hash', 'summary',
+    'summary_data', 'quality_scores', 'mindmap', 'mindmap_svg', 'pdf_data', 'enhanced_text',
+    'proofread_chunks'
+)
+
+# Widget option labels; dict order is the option order and format_func is
+# the bound __getitem__, so no lambda or dict is built per option
+SUMMARY_STYLE_LABELS = {
+    "detailed": "詳細 (より詳しい分析と説明)",
+    "overview": "概要 (簡潔なポイントのみ)",
+}
+SORT_BY_LABELS = {
+    "analysis_date": "分析日時",
+    "view_count": "視聴回数",
+}
+SORT_ORDER_LABELS = {
+    "descending": "降順",
+    "ascending": "昇順",
+}
+
+# Page configuration
+st.set_page_config(page_title="YouTube InsightMap",
+                   page_icon="🎯",
+                   layout="wide",
+                   initial_sidebar_state="collapsed")
+
+# Load CSS
+@st.cache_resource(show_spinner=False, max_entries=1)
+def read_css(css_path: str, mtime: float) -> str:
+    """Build the <style> block once per stylesheet modification time"""
+    # cache_resource hands back the same string instead of a copy per rerun
+    with open(css_path) as f:
+        return f'<style>{f.read()}</style>'
+
+def load_css():
+    try:
+        css_path = os.path.join(os.path.dirname(__file__), 'styles',
+                                'custom.css')
+        # Streamlit drops elements that are not re-emitted, so the
+        # <style> block is written on every rerun from the cache
+        st.markdown(read_css(css_path, os.path.getmtime(css_path)),
+                    unsafe_allow_html=True)
+    except FileNotFoundError:
+        logger.error("CSS file not found!")
+    except Exception as e:
+        logger.error(f"Error loading CSS: {str(e)}")
+
+load_css()
+
+@st.cache_resource
+def get_youtube_helper() -> YouTubeHelper:
+    """Share one YouTube API client across reruns and sessions"""
+    return YouTubeHelper()
+
+def canonical_video_url(url: str) -> str:
+    """Normalize any YouTube URL form so equivalent URLs share cache entries"""
+    video_id = get_youtube_helper().extract_video_id(url)
+    return f"https://youtube.com/watch?v={video_id}"
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_video_info(url: str) -> dict:
+    """Fetch video metadata, cached per URL for an hour"""
+    return get_youtube_helper().get_video_info(url)
+
+@st.cache_resource
+def get_text_processor() -> TextProcessor:
+    """Share one configured Gemini client across reruns and sessions"""
+    return TextProcessor()
+
+# persist="disk" keeps transcripts across restarts; Streamlit ignores
+# ttl for persisted caches, so none is set
+@st.cache_data(persist="disk", show_spinner=False)
+def fetch_transcript(url: str) -> str:
+    """Fetch the transcript for a video URL, shared across sessions"""
+    return get_text_processor().get_transcript(url)
+
+# The leading underscore tells Streamlit not to hash the transcript;
+# transcript_hash already identifies it
+@st.cache_data(persist="disk", show_spinner=False, max_entries=32)
+def generate_summary(transcript_hash: str, _transcript: str, style: str) -> tuple:
+    """Generate a summary once per transcript and style"""
+    return get_text_processor().generate_summary(_transcript, style=style)
+
+# Same digest keying as generate_summary. Chunks are appended to _chunks
+# while the model streams; a cache hit returns at once and leaves it empty.
+# _cancel is checked between chunks so an abandoned stream frees its worker
+@st.cache_data(persist="disk", show_spinner=False, max_entries=16)
+def proofread_transcript(transcript_hash: str, _transcript: str,
+                         _chunks: list, _cancel: threading.Event) -> str:
+    """Proofread a transcript once, streaming the chunks into _chunks"""
+    for chunk in get_text_processor().proofread_text_stream(_transcript):
+        if _cancel.is_set():
+            # Raising, not returning, keeps the partial text out of the cache
+            raise ValueError("文章校正が中断されました")
+        _chunks.append(chunk)
+    return "".join(_chunks)
+
+@st.cache_resource
+def get_mindmap_generator():
+    """Share one mindmap generator across reruns and sessions"""
+    # Imported here so cold start does not pay for Step 3-only modules
+    from utils.mindmap_generator import MindMapGenerator
+    return MindMapGenerator()
+
+# In memory only: the transform is local and cheaper than a disk round trip
+@st.cache_data(show_spinner=False, max_entries=16)
+def generate_mindmap(summary: str) -> tuple:
+    """Build the Mermaid mindmap once per summary"""
+    return get_mindmap_generator().generate_mindmap(summary)
+
+@st.cache_resource
+def get_notion_helper() -> NotionHelper:
+    """Share one Notion client across reruns and sessions"""
+    return NotionHelper()
+
+def get_executor() -> ThreadPoolExecutor:
+    """This session's worker pool for background jobs"""
+    # One pool per session, so a session's jobs never queue behind another
+    # user's. Four workers cover a summary for each style, proofreading and
+    # the mindmap at once. Threads start on demand and exit once the session
+    # state, and with it the pool, is garbage collected
+    if 'executor' not in st.session_state:
+        st.session_state.executor = ThreadPoolExecutor(max_workers=4)
+    return st.session_state.executor
+
+def submit_job(name: str, fn, *args) -> bool:
+    """Start fn(*args) in the background; True if no such job existed yet"""
+    # Callers st.rerun() the app on True: a fragment rerun never reaches the
+    # end-of-script poll, and a full run registers poll_background_jobs
+    if name in st.session_state.jobs:
+        return False
+    # Jobs run without a ScriptRunContext: they only call cached functions,
+    # which never read it, and one attached to a worker thread would keep
+    # the session state that owns the pool alive
+    st.session_state.jobs[name] = get_executor().submit(fn, *args)
+    return True
+
+@st.fragment(run_every=0.5)
+def poll_background_jobs(job_names: tuple):
+    """Rerun the app as soon as one of the given jobs has finished"""
+    jobs = st.session_state.jobs
+    if any(name not in jobs or jobs[name].done() for name in job_names):
+        st.rerun()
+
+# Jobs whose progress message this run showed; the end of the script polls
+# these. main.py is re-executed on every rerun, so it starts empty each run
+awaited_job_names = set()
+
+def show_progress_message(job_name: str, text: str, icon: str = "🔄"):
+    """Show the shared in-progress notice for a pending background job"""
+    awaited_job_names.add(job_name)
+    st.html(PROGRESS_MESSAGE_TEMPLATE.format(icon=icon, text=text))
+
+def cancel_all_jobs():
+    """Forget every background job, cancelling or stopping what it can"""
+    # Queued jobs never start. A running proofread stream stops at its next
+    # chunk; the other jobs are single requests and finish on their own,
+    # their results unread since they are gone from st.session_state.jobs
+    for job in st.session_state.jobs.values():
+        job.cancel()
+    st.session_state.jobs.clear()
+    st.session_state.job_cancel.set()
+    st.session_state.job_cancel = threading.Event()
+
+def pop_finished_job(name: str):
+    """Remove and return the job's future once it has finished, else None"""
+    job = st.session_state.jobs.get(name)
+    if job is None or not job.done():
+        return None
+    return st.session_state.jobs.pop(name)
+
+# サイドバーの設定
+def setup_sidebar():
+    with st.sidebar:
+        st.markdown("## 🔍 保存済みデータ検索")
+        search_query = st.text_input("検索", placeholder="タイトルまたはチャンネル名で検索")
+        sort_by = st.selectbox(
+            "並び替え",
+            options=list(SORT_BY_LABELS),
+            format_func=SORT_BY_LABELS.__getitem__
+        )
+        sort_order = st.radio(
+            "並び順",
+            options=list(SORT_ORDER_LABELS),
+            format_func=SORT_ORDER_LABELS.__getitem__,
+            horizontal=True
+        )
+        return search_query, sort_by, sort_order
+
+# データ一覧の表示
+def display_saved_data(notion_helper, search_query, sort_by, ascending):
+    try:
+        success, pages = notion_helper.get_video_pages(
+            search_query=search_query,
+            sort_by=sort_by,
+            ascending=ascending
+        )
+        
+        if success:
+            data_count = len(pages) if pages else 0
+            with st.expander(f"📚 保存済み分析データ ({data_count}件)", expanded=True):
+                if pages:
+                    for page in pages:
+                        st.markdown(f"""
+                        <div class="video-card glass-container">
+                            <div class="video-card-header">
+                                <h3 class="video-title">🎥 {page['title']}</h3>
+                            </div>
+                            <div class="video-card-content">
+                                <div class="video-info-grid">
+                                    <div class="info-section">
+                                        <div class="info-item">
+                                            <span class="info-label">📺 チャンネル</span>
+                                            <span class="info-value">{page['channel']}</span>
+                                        </div>
+                                        <div class="info-item">
+                                            <span class="info-label">📅 分析日時</span>
+                                            <span class="info-value">{datetime.fromisoformat(page['analysis_date'].replace('Z', '+00:00')).astimezone(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S (JST)')}</span>
+                                        </div>
+                                    </div>
+                                    <div class="info-section">
+                                        <div class="info-item">
+                                            <span class="info-label">👁️ 視聴回数</span>
+                                            <span class="info-value">{page['view_count']:,}回</span>
+                                        </div>
+                                        <div class="info-item">
+                                            <span class="info-label">⏱️ 動画時間</span>
+                                            <span class="info-value">{page['duration']}</span>
                                         </div>
-                                        <div class="info-section">
-                                            <div class="info-item">
-                                                <span class="info-label">👁️ 視聴回数</span>
-                                                <span class="info-value">{page['view_count']:,}回</span>
-                                            </div>
-                                            <div class="info-item">
-                                                <span class="info-label">⏱️ 動画時間</span>
-                                                <span class="info-value">{page['duration']}</span>
-                                            </div>
+                                    </div>
+                                    <div class="info-section">
+                                        <div class="info-item">
+                                            <span class="info-label">📊 ステータス</span>
+                                            <span class="info-value status-badge">{page['status']}</span>
                                         </div>
-                                        <div class="info-section">
-                                            <div class="info-item">
-                                                <span class="info-label">📊 ステータス</span>
-                                                <span class="info-value status-badge">{page['status']}</span>
-                                            </div>
-                                            <div class="info-item">
-                                                <a href="{page['url']}" target="_blank" class="video-link">
-                                                    <span class="link-icon">🔗</span> 動画を見る
-                                                </a>
-                                            </div>
+                                        <div class="info-item">
+                                            <a href="{page['url']}" target="_blank" class="video-link">
+                                                <span class="link-icon">🔗</span> 動画を見る
+                                            </a>
                                         </div>
                                     </div>
                                 </div>
                             </div>
-                            """, unsafe_allow_html=True)
-                    else:
-                        st.info("保存された分析データがありません")
-            else:
-                with st.expander(f"📚 保存済み分析データ (0件)", expanded=True):
-                    st.error(pages)  # エラーメッセージを表示
-                
-        except Exception as e:
-            st.error(f"データの表示中にエラーが発生しました: {str(e)}")
-            logger.error(f"Error displaying saved data: {str(e)}")
+                        </div>
+                        """, unsafe_allow_html=True)
+                else:
+                    st.info("保存された分析データがありません")
+        else:
+            with st.expander(f"📚 保存済み分析データ (0件)", expanded=True):
+                st.error(pages)  # エラーメッセージを表示
+            
+    except Exception as e:
+        st.error(f"データの表示中にエラーが発生しました: {str(e)}")
+        logger.error(f"Error displaying saved data: {str(e)}")
 
-    def copy_text_block(text, label=""):
-        try:
-            if label:
-                st.markdown(f"#### {label}")
-            st.markdown(text, unsafe_allow_html=False)
-        except Exception as e:
-            logger.error(f"Error in copy_text_block: {str(e)}")
-
-    # Initialize session state with error handling
-    if 'current_step' not in st.session_state:
-        st.session_state.current_step = 1
-    if 'steps_completed' not in st.session_state:
-        st.session_state.steps_completed = {
-            'video_info': False,
-            'transcript': False,
-            'summary': False,
-            'mindmap': False,
-            'proofread': False,
-            'pdf': False
-        }
-    if 'video_info' not in st.session_state:
-        st.session_state.video_info = None
-    if 'transcript' not in st.session_state:
-        st.session_state.transcript = None
-    if 'summary' not in st.session_state:
-        st.session_state.summary = None
-    if 'quality_scores' not in st.session_state:
-        st.session_state.quality_scores = None
-    if 'mindmap' not in st.session_state:
-        st.session_state.mindmap = None
-    if 'mindmap_svg' not in st.session_state:
-        st.session_state.mindmap_svg = None
-    if 'pdf_data' not in st.session_state:
-        st.session_state.pdf_data = None
-    if 'enhanced_text' not in st.session_state:
-        st.session_state.enhanced_text = None
-    if 'enhancement_progress' not in st.session_state:
-        st.session_state.enhancement_progress = {
-            'progress': 0.0,
-            'message': ''
-        }
-    if 'current_summary_style' not in st.session_state:
-        st.session_state.current_summary_style = "overview"  # Default to overview
-
-    def update_step_progress(step_name: str, completed: bool = True):
-        """Update the completion status of a processing step"""
-        try:
-            st.session_state.steps_completed[step_name] = completed
-        except Exception as e:
-            logger.error(f"Error updating step progress: {str(e)}")
-
-    # Application Header
-    st.markdown('''
-    <div class="app-header">
-        <div class="app-title">YouTube InsightMap</div>
-        <div class="app-subtitle">Content Knowledge Visualization</div>
-    </div>
-    ''',
-                unsafe_allow_html=True)
-
-    def get_step_status(step_number):
-        try:
-            if st.session_state.current_step > step_number:
-                return "completed"
-            elif st.session_state.current_step == step_number:
-                return "active"
-            return ""
-        except Exception as e:
-            logger.error(f"Error getting step status: {str(e)}")
-            return ""
+def copy_text_block(text, label=""):
+    try:
+        if label:
+            st.markdown(f"#### {label}")
+        # st.code skips the markdown parser, which is costly on a long
+        # transcript, and adds a copy button
+        st.code(text, language=None, wrap_lines=True)
+    except Exception as e:
+        logger.error(f"Error in copy_text_block: {str(e)}")
 
-    def render_step_header(step_number, title, emoji, description=""):
-        try:
-            status = get_step_status(step_number)
-            st.markdown(f'''
-            <div class="step-header {status}">
-                <div class="step-content">
-                    <div class="step-title">{emoji} {title}</div>
-                    {f'<div class="step-description">{description}</div>' if description else ''}
-                </div>
-            </div>
-            ''',
-                        unsafe_allow_html=True)
-        except Exception as e:
-            logger.error(f"Error rendering step header: {str(e)}")
-
-    def get_score_indicator(score: float) -> tuple:
-        """Get visual indicator and color class based on score"""
-        if score >= 7:
-            return "✅", "high"
-        elif score >= 5:
-            return "⚠️", "medium"
-        return "❌", "low"
-
-    def render_quality_score(score: float, label: str, description: str):
-        """品質スコアを視覚的に表示"""
-        indicator, score_class = get_score_indicator(score)
+# Initialize session state with error handling
+try:
+    for key, value in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+except Exception as e:
+    logger.error(f"Error initializing session state: {str(e)}")
+
+def update_step_progress(step_name: str, completed: bool = True):
+    """Update the completion status of a processing step"""
+    try:
+        if completed:
+            st.session_state.steps_completed |= STEP_BITS[step_name]
+        else:
+            st.session_state.steps_completed &= ~STEP_BITS[step_name]
+    except Exception as e:
+        logger.error(f"Error updating step progress: {str(e)}")
+
+# Application header and feature introduction
+st.html(APP_INTRO_HTML)
+
+def get_step_status(step_number):
+    try:
+        if st.session_state.current_step > step_number:
+            return "completed"
+        elif st.session_state.current_step == step_number:
+            return "active"
+        return ""
+    except Exception as e:
+        logger.error(f"Error getting step status: {str(e)}")
+        return ""
+
+def render_step_header(step_number):
+    try:
+        status = get_step_status(step_number)
+        st.html(STEP_HEADER_HTML[(step_number, status)])
+    except Exception as e:
+        logger.error(f"Error rendering step header: {str(e)}")
+
+def quality_score_html(score: float, label: str, description: str) -> str:
+    """品質スコアの表示用HTMLを生成"""
+    indicator, score_class = SCORE_INDICATORS[max(0, min(int(score), 10))]
+    return SCORE_ITEM_TEMPLATE.format_map({
+        "indicator": indicator,
+        "label": label,
+        "score_class": score_class,
+        "score": score,
+        "description": description,
+        "width": score * 10,
+    })
+
+# (key, description) for each quality score, in display order
+QUALITY_SCORE_ITEMS = (
+    ("構造の完全性", "要約の構造がどれだけ整っているか"),
+    ("情報量", "重要な情報をどれだけ含んでいるか"),
+    ("簡潔性", "簡潔に要点を示せているか"),
+    ("総合スコア", "全体的な要約の質"),
+)
+
+def display_summary(summary_data: dict):
+    """Display formatted summary with importance indicators"""
+    try:
+        # Always display overview
+        st.markdown("## 📑 動画の概要")
+        st.markdown(summary_data.get("動画の概要", ""))
         
-        st.markdown(f"""
-        <div class="score-item">
-            <div class="score-header">
-                <div class="score-title">
-                    {indicator} {label}
-                    <div class="score-range score-{score_class}">
-                        {score:.1f}/10
-                    </div>
-                </div>
-            </div>
-            <div class="score-description">{description}</div>
-            <div class="score-bar">
-                <div class="score-fill {score_class}" style="width: {score*10}%;"></div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    def display_summary(summary_text: str):
-        """Display formatted summary with importance indicators"""
-        try:
-            # Ensure the summary is valid JSON
-            if not summary_text or not summary_text.strip():
-                raise ValueError("要約テキストが空です")
+        if st.session_state.current_summary_style == "detailed":
+            # Display points with proper type conversion
+            st.markdown("## 🎯 主要ポイント")
+            cards = []
+            for point in summary_data.get("ポイント", []):
+                try:
+                    importance = int(point.get("重要度", 3))
+                except (ValueError, TypeError):
+                    importance = 3
                 
-            summary_data = json.loads(summary_text.strip())
+                importance_class, emoji = importance_tier(importance)
+                supplementary = (SUPPLEMENTARY_TEMPLATE.format(point.get("補足情報", ""))
+                                 if "補足情報" in point else "")
+                cards.append(POINT_CARD_TEMPLATE.format(
+                    importance_class=importance_class,
+                    emoji=emoji,
+                    number=point.get("番号", ""),
+                    title=point.get("タイトル", ""),
+                    content=point.get("内容", ""),
+                    supplementary=supplementary
+                ))
+            # One element for all cards instead of one per point
+            if cards:
+                st.html("\n".join(cards))
             
-            # Always display overview
-            st.markdown("## 📑 動画の概要")
-            st.markdown(summary_data.get("動画の概要", ""))
+            st.markdown("## 🔑 重要なキーワード")
+            keyword_cards = [KEYWORD_CARD_TEMPLATE.format(
+                term=keyword.get("用語", ""),
+                description=keyword.get("説明", ""),
+                related=(RELATED_TERMS_TEMPLATE.format(", ".join(keyword.get("関連用語", [])))
+                         if "関連用語" in keyword else "")
+            ) for keyword in summary_data.get("キーワード", [])]
+            if keyword_cards:
+                st.html("\n".join(keyword_cards))
             
-            if st.session_state.current_summary_style == "detailed":
-                # Display points with proper type conversion
-                st.markdown("## 🎯 主要ポイント")
-                for point in summary_data.get("ポイント", []):
+            # Display quality scores only in detailed mode; the section is a
+            # single element so the wrapper divs actually enclose the scores
+            quality_scores = st.session_state.quality_scores
+            if quality_scores:
+                score_items = "\n".join(
+                    quality_score_html(quality_scores[key], key, description)
+                    for key, description in QUALITY_SCORE_ITEMS
+                )
+                st.html(QUALITY_SECTION_TEMPLATE.format(score_items))
+        
+        # Always display conclusion
+        st.markdown("## 💡 結論")
+        st.markdown(summary_data.get("結論", ""))
+            
+    except Exception as e:
+        logger.error(f"Summary display error: {str(e)}")
+        st.error("要約の表示中にエラーが発生しました")
+
+@st.fragment(run_every=0.5)
+def show_proofread_progress():
+    """Re-render the partial proofread text while its job is streaming"""
+    chunks = st.session_state.proofread_chunks
+    if chunks:
+        st.markdown("".join(chunks))
+
+def render_proofreading_tab():
+    """Proofreading tab; rendered inside the Step 3 fragment"""
+    st.markdown("### ✨ Proofreading")
+    if not st.session_state.transcript:
+        st.info("校正を開始するには、まず文字起こしを生成してください。")
+    else:
+        if not st.session_state.enhanced_text:
+            job_name = f"proofread_{st.session_state.transcript_hash}"
+            if (job_name not in st.session_state.jobs and
+                    st.button("文章を校正する")):
+                # The job appends to this list; the tab reads it back below
+                chunks = []
+                st.session_state.proofread_chunks = chunks
+                if submit_job(job_name, proofread_transcript,
+                              st.session_state.transcript_hash,
+                              st.session_state.transcript,
+                              chunks, st.session_state.job_cancel):
+                    st.rerun()
+            if job_name in st.session_state.jobs:
+                job = pop_finished_job(job_name)
+                if job is None:
+                    show_progress_message(job_name, "テキストを校正中...")
+                    show_proofread_progress()
+                else:
+                    st.session_state.proofread_chunks = None
                     try:
-                        importance = int(point.get("重要度", 3))
-                    except (ValueError, TypeError):
-                        importance = 3
-                    
-                    emoji = "🔥" if importance >= 4 else "⭐" if importance >= 2 else "ℹ️"
-                    
-                    st.markdown(f'''
-                        <div class="summary-card">
-                            <div class="importance-{'high' if importance >= 4 else 'medium' if importance >= 2 else 'low'}">
-                                {emoji} <strong>ポイント{point.get("番号", "")}: {point.get("タイトル", "")}</strong>
-                            </div>
-                            <p>{point.get("内容", "")}</p>
-                            {f'<p class="supplementary-info">{point.get("補足情報", "")}</p>' if "補足情報" in point else ""}
-                        </div>
-                    ''', unsafe_allow_html=True)
-                
-                st.markdown("## 🔑 重要なキーワード")
-                for keyword in summary_data.get("キーワード", []):
-                    st.markdown(f'''
-                        <div class="keyword-card">
-                            <strong>{keyword.get("用語", "")}</strong>: {keyword.get("説明", "")}
-                            {f'<div class="related-terms">関連用語: {", ".join(keyword.get("関連用語", []))}</div>' if "関連用語" in keyword else ""}
-                        </div>
-                    ''', unsafe_allow_html=True)
-                
-                # Display quality scores only in detailed mode
-                quality_scores = st.session_state.quality_scores
-                if quality_scores:
-                    st.markdown('''
-                    <div class="quality-score-section">
-                        <h3>要約品質スコア</h3>
-                        <div class="quality-score-container">
-                    ''', unsafe_allow_html=True)
-                    
-                    render_quality_score(
-                        quality_scores["構造の完全性"],
-                        "構造の完全性",
-                        "要約の構造がどれだけ整っているか"
-                    )
-                    render_quality_score(
-                        quality_scores["情報量"],
-                        "情報量",
-                        "重要な情報をどれだけ含んでいるか"
-                    )
-                    render_quality_score(
-                        quality_scores["簡潔性"],
-                        "簡潔性",
-                        "簡潔に要点を示せているか"
-                    )
-                    render_quality_score(
-                        quality_scores["総合スコア"],
-                        "総合スコア",
-                        "全体的な要約の質"
-                    )
-                    
-                    st.markdown('</div></div>', unsafe_allow_html=True)
+                        st.session_state.enhanced_text = job.result()
+                        update_step_progress('proofread')
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"テキストの校正中にエラーが発生しました: {str(e)}")
+                        logger.error(f"Error in text proofreading: {str(e)}")
+
+        if st.session_state.enhanced_text:
+            st.markdown("### ✨ 文章校正が完了しました！")
+            st.markdown(st.session_state.enhanced_text)
+            st.success("校正が完了しました。文章の論理構造、読みやすさ、表現の適切性を改善しました。")
+
+@st.fragment
+def render_content_analysis():
+    """Step 3 body; a fragment so tab and button interactions skip Steps 1-2"""
+    if st.session_state.transcript:
+        # Add style selection with proper label
+        summary_style = st.radio(
+            "要約スタイル",
+            options=list(SUMMARY_STYLE_LABELS),
+            format_func=SUMMARY_STYLE_LABELS.__getitem__,
+            help="要約の詳細度を選択してください"
+        )
+
+        # Initialize tabs
+        tabs = st.tabs([
+            "📝 Transcript", "📊 Summary", "🔄 Mind Map", "✨ Proofreading", "📚 NotionDB"
+        ])
+
+        with tabs[0]:
+            st.markdown("### Original Transcript")
+            copy_text_block(st.session_state.transcript)
+
+        with tabs[1]:
+            if (not st.session_state.summary or
+                st.session_state.current_summary_style != summary_style):
+                # Keyed on the transcript too, so a result can only ever be
+                # applied to the transcript it was generated from
+                job_name = f"summary_{st.session_state.transcript_hash}_{summary_style}"
+                if submit_job(job_name, generate_summary,
+                              st.session_state.transcript_hash,
+                              st.session_state.transcript,
+                              summary_style):
+                    st.rerun()
+                job = pop_finished_job(job_name)
+                if job is None:
+                    show_progress_message(job_name, "要約を生成中...")
+                else:
+                    try:
+                        summary, quality_scores = job.result()
+                        # Parsed once here; the raw JSON is kept for the
+                        # mindmap and Notion, which both take the string
+                        st.session_state.summary_data = json_loads(summary)
+                        st.session_state.current_summary_style = summary_style
+                        st.session_state.summary = summary
+                        st.session_state.quality_scores = quality_scores
+                        update_step_progress('summary')
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"要約の生成に失敗しました: {str(e)}")
+                        logger.error(f"Error in summary generation: {str(e)}")
+                        st.stop()
             
-            # Always display conclusion
-            st.markdown("## 💡 結論")
-            st.markdown(summary_data.get("結論", ""))
-                
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing error: {str(e)}")
-            st.error("要約データの形式が正しくありません。再試行してください。")
-        except Exception as e:
-            logger.error(f"Summary display error: {str(e)}")
-            st.error("要約の表示中にエラーが発生しました")
+            if st.session_state.summary_data:
+                display_summary(st.session_state.summary_data)
 
-    # Feature Introduction
-    # サイドバーの設定と保存済みデータの準備
-    try:
-        notion_helper = NotionHelper()
-        search_query, sort_by, sort_order = setup_sidebar()
-    except Exception as e:
-        st.sidebar.error(f"データの読み込みに失敗しました: {str(e)}")
-        logger.error(f"Error loading saved data: {str(e)}")
-
-    st.markdown('''
-    <div class="glass-container feature-container">
-        <h4 class="section-header" style="margin-top: 0;">🎯 Advanced Content Analysis</h4>
-        <div class="feature-grid">
-            <div class="feature-card">
-                <div class="feature-icon">📝</div>
-                <h5 class="feature-title">文字起こし</h5>
-            </div>
-            <div class="feature-card">
-                <div class="feature-icon">🤖</div>
-                <h5 class="feature-title">要約</h5>
-            </div>
-            <div class="feature-card">
-                <div class="feature-icon">🔄</div>
-                <h5 class="feature-title">マップ化</h5>
-            </div>
-        </div>
-    </div>
-    ''',
-                unsafe_allow_html=True)
-
-    # Main application logic
-    try:
-        # Step 1: Video Input
-        with st.expander("Step 1: Video Input",
-                         expanded=st.session_state.current_step == 1):
-            render_step_header(1, "Video Input", "🎥",
-                               "分析したいYouTube動画のURLを入力してください")
-
-            youtube_url = st.text_input(
-                "YouTube URL",
-                placeholder="https://www.youtube.com/watch?v=...",
-                help="分析したいYouTube動画のURLを入力してください")
-
-            if youtube_url:
-                try:
-                    yt_helper = YouTubeHelper()
-                    video_info = yt_helper.get_video_info(youtube_url)
-                    st.session_state.video_info = video_info
-                    st.session_state.current_step = 2
-                    update_step_progress('video_info')
-                    time.sleep(0.5)
-                except Exception as e:
-                    st.error(f"動画情報の取得に失敗しました: {str(e)}")
-                    logger.error(f"Error in video info retrieval: {str(e)}")
-                    st.stop()
-
-        # Step 2: Content Overview
-        with st.expander("Step 2: Content Overview",
-                         expanded=st.session_state.current_step == 2):
-            render_step_header(2, "Content Overview", "📊",
-                               "動画の基本情報と文字起こしを表示します")
-            if st.session_state.video_info:
-                video_info = st.session_state.video_info
-
-                st.markdown(f'''
-                <div class="glass-container video-info">
-                    <div class="video-grid">
-                        <div class="video-thumbnail">
-                            <img src="{video_info['thumbnail_url']}" alt="Video thumbnail" style="width: 100%; border-radius: 8px;">
-                        </div>
-                        <div class="video-details">
-                            <h2 class="video-title">{video_info['title']}</h2>
-                            <div class="video-stats">
-                                <span class="stat-badge">👤 {video_info['channel_title']}</span>
-                                <span class="stat-badge">⏱️ {video_info['duration']}</span>
-                                <span class="stat-badge">👁️ {video_info['view_count']}回視聴</span>
-                            </div>
-                            <p class="video-date">📅 投稿日: {video_info['published_at']}</p>
-                        </div>
-                    </div>
-                </div>
-                ''',
-                            unsafe_allow_html=True)
-
-                if 'transcript' not in st.session_state or not st.session_state.transcript:
-                    st.markdown('''
-                    <div class="process-step">
-                        <div class="step-content">文字起こしを生成します</div>
-                    </div>
-                    ''',
-                                unsafe_allow_html=True)
+        with tabs[2]:
+            st.markdown("### 🔄 Mind Map")
+            if not st.session_state.summary:
+                st.info("マインドマップを生成するには、まず要約を生成してください。")
+            else:
+                mindmap_job = (f"mindmap_{st.session_state.transcript_hash}_"
+                               f"{st.session_state.current_summary_style}")
+                if st.button("マインドマップ生成"):
+                    logger.info("Starting mindmap generation process")
+                    if submit_job(mindmap_job, generate_mindmap,
+                                  st.session_state.summary):
+                        st.rerun()
+                if mindmap_job in st.session_state.jobs:
+                    job = pop_finished_job(mindmap_job)
+                    if job is None:
+                        show_progress_message(mindmap_job, "マインドマップを生成中...")
+                    else:
+                        try:
+                            mindmap_content, success = job.result()
+                            if success:
+                                st.session_state.mindmap = mindmap_content
+                                logger.info("マインドマップを生成し、セッションに保存しました")
+                                update_step_progress('mindmap')
+                                st.rerun()
+                            else:
+                                st.error("マインドマップの生成に失敗しました")
+                        except Exception as e:
+                            st.error(f"マインドマップの生成中にエラーが発生しました: {str(e)}")
+                            logger.error(f"Error in mindmap generation: {str(e)}")
 
+                if st.session_state.mindmap:
                     try:
-                        text_processor = TextProcessor()
-                        transcript = text_processor.get_transcript(youtube_url)
-                        st.session_state.transcript = transcript
-                        st.session_state.current_step = 3
-                        update_step_progress('transcript')
-                        time.sleep(0.5)
+                        st_mermaid(st.session_state.mindmap, key="mindmap_display_1")
                     except Exception as e:
-                        st.error(f"文字起こしの生成に失敗しました: {str(e)}")
-                        logger.error(
-                            f"Error in transcript generation: {str(e)}")
-                        st.stop()
+                        st.error(f"マインドマップの表示中にエラーが発生しました: {str(e)}")
+                        logger.error(f"Error displaying mindmap: {str(e)}")
 
-        # Step 3: Content Analysis
-        with st.expander("Step 3: Content Analysis",
-                         expanded=st.session_state.current_step == 3):
-            render_step_header(3, "Content Analysis", "🔍",
-                               "文字起こし、要約、マインドマップを生成します")
-            if st.session_state.transcript:
-                # Add style selection with proper label
-                summary_style = st.radio(
-                    "要約スタイル",
-                    options=["detailed", "overview"],
-                    format_func=lambda x: {
-                        "detailed": "詳細 (より詳しい分析と説明)",
-                        "overview": "概要 (簡潔なポイントのみ)"
-                    }[x],
-                    help="要約の詳細度を選択してください"
-                )
+        with tabs[3]:
+            render_proofreading_tab()
 
-                # Initialize text processor outside tabs to ensure proper scope
-                if 'text_processor' not in st.session_state:
-                    st.session_state.text_processor = TextProcessor()
+        with tabs[4]:
+            st.markdown("### 📚 Notion Database")
+            if not (st.session_state.video_info and st.session_state.transcript):
+                st.info("Notionに保存するには、動画情報と文字起こしが必要です。")
+            else:
+                st.markdown("### 📋 Notionデータベース保存")
+                st.info("分析結果をNotionデータベースに保存できます。サムネイル画像も自動的に保存されます。")
                 
-                # Initialize tabs
-                tabs = st.tabs([
-                    "📝 Transcript", "📊 Summary", "🔄 Mind Map", "✨ Proofreading", "📚 NotionDB"
-                ])
-
-                with tabs[0]:
-                    st.markdown("### Original Transcript")
-                    copy_text_block(st.session_state.transcript)
-
-                with tabs[1]:
-                    if ('summary' not in st.session_state or 
-                        not st.session_state.summary or
-                        st.session_state.current_summary_style != summary_style):
-                        
-                        # Clear previous summary when style changes
-                        st.session_state.current_summary_style = summary_style
+                if st.button("🔄 Notionに保存", key="notion_save_button", help="クリックして分析結果をNotionに保存"):
+                    with st.spinner("Notionに保存中..."):
                         try:
-                            summary, quality_scores = st.session_state.text_processor.generate_summary(
-                                st.session_state.transcript,
-                                style=summary_style
+                            notion_helper = get_notion_helper()
+                            success, message = notion_helper.save_video_analysis(
+                                video_info=st.session_state.video_info,
+                                summary=st.session_state.summary,
+                                transcript=st.session_state.transcript,
+                                mindmap=st.session_state.mindmap,
+                                proofread_text=st.session_state.enhanced_text
                             )
-                            st.session_state.summary = summary
-                            st.session_state.quality_scores = quality_scores
-                            update_step_progress('summary')
-                            st.rerun()
+                            
+                            if success:
+                                st.success("✅ " + message)
+                                st.balloons()
+                            else:
+                                st.error("❌ " + message)
+                                
                         except Exception as e:
-                            st.error(f"要約の生成に失敗しました: {str(e)}")
-                            logger.error(f"Error in summary generation: {str(e)}")
-                            st.stop()
-                    
-                    if st.session_state.summary:
-                        display_summary(st.session_state.summary)
-
-                with tabs[2]:
-                    st.markdown("### 🔄 Mind Map")
-                    if not st.session_state.summary:
-                        st.info("マインドマップを生成するには、まず要約を生成してください。")
-                    else:
-                        generate_mindmap = st.button("マインドマップ生成")
-                        if generate_mindmap:
-                            st.markdown("### マインドマップを生成中...")
-                            try:
-                                logger.info("Starting mindmap generation process")
-                                mindmap_generator = MindMapGenerator()
-                                mindmap_content, success = mindmap_generator.generate_mindmap(st.session_state.summary)
-                                if success:
-                                    st.session_state.mindmap = mindmap_content
-                                    logger.info("マインドマップを生成し、セッションに保存しました")
-                                    update_step_progress('mindmap')
-                                    st.rerun()
-                                else:
-                                    st.error("マインドマップの生成に失敗しました")
-                            except Exception as e:
-                                st.error(f"マインドマップの生成中にエラーが発生しました: {str(e)}")
-                                logger.error(f"Error in mindmap generation: {str(e)}")
-
-                        if st.session_state.mindmap:
-                            try:
-                                st_mermaid(st.session_state.mindmap, key="mindmap_display_1")
-                            except Exception as e:
-                                st.error(f"マインドマップの表示中にエラーが発生しました: {str(e)}")
-                                logger.error(f"Error displaying mindmap: {str(e)}")
-
-                with tabs[3]:
-                    st.markdown("### ✨ Proofreading")
-                    if not st.session_state.transcript:
-                        st.info("校正を開始するには、まず文字起こしを生成してください。")
-                    else:
-                        if not st.session_state.enhanced_text:
-                            if st.button("文章を校正する"):
-                                st.markdown("### テキストを校正中...")
-                                try:
-                                    proofread_prompt = f'''
-以下のテキストを高品質な文章に校正してください。以下の観点から包括的に改善を行ってください：
-
-1. 文章の論理構造と文脈の一貫性を整理
-2. 読点・句点の適切な配置による読みやすさの向上
-3. 漢字とかなの使い分けの最適化
-4. 文体の統一性と自然な文章の流れの確保
-5. 冗長な表現の簡潔化と明確な意味伝達
-6. 専門用語の適切な使用と必要に応じた説明の追加
-7. 段落構成の改善による理解しやすい文章構造
-8. 話し言葉から書き言葉への適切な変換
-
-入力テキスト:
-{st.session_state.transcript}
-
-上記のテキストを、論理的で読みやすい自然な日本語に校正してください。
-文章全体の一貫性と文脈を維持しながら、より洗練された表現に改善してください。
-'''
-                                    response = st.session_state.text_processor.model.generate_content(proofread_prompt)
-                                    st.session_state.enhanced_text = response.text
-                                    update_step_progress('proofread')
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"テキストの校正中にエラーが発生しました: {str(e)}")
-                                    logger.error(f"Error in text proofreading: {str(e)}")
-
-                        if st.session_state.enhanced_text:
-                            st.markdown("### ✨ 文章校正が完了しました！")
-                            st.markdown(st.session_state.enhanced_text)
-                            st.success("校正が完了しました。文章の論理構造、読みやすさ、表現の適切性を改善しました。")
-
-                with tabs[4]:
-                    st.markdown("### 📚 Notion Database")
-                    if not (st.session_state.video_info and st.session_state.transcript):
-                        st.info("Notionに保存するには、動画情報と文字起こしが必要です。")
-                    else:
-                        st.markdown("### 📋 Notionデータベース保存")
-                        st.info("分析結果をNotionデータベースに保存できます。サムネイル画像も自動的に保存されます。")
-                        
-                        if st.button("🔄 Notionに保存", key="notion_save_button", help="クリックして分析結果をNotionに保存"):
-                            with st.spinner("Notionに保存中..."):
-                                try:
-                                    notion_helper = NotionHelper()
-                                    success, message = notion_helper.save_video_analysis(
-                                        video_info=st.session_state.video_info,
-                                        summary=st.session_state.summary,
-                                        transcript=st.session_state.transcript,
-                                        mindmap=st.session_state.mindmap,
-                                        proofread_text=st.session_state.enhanced_text
-                                    )
-                                    
-                                    if success:
-                                        st.success("✅ " + message)
-                                        st.balloons()
-                                    else:
-                                        st.error("❌ " + message)
-                                        
-                                except Exception as e:
-                                    st.error(f"❌ Notionへの保存中にエラーが発生しました: {str(e)}")
-                                    logger.error(f"Error saving to Notion: {str(e)}")
-
-    except Exception as e:
-        st.error(f"アプリケーションエラー: {str(e)}")
-        logger.error(f"Application error: {str(e)}")
-
-    # 保存済みデータの表示（最下部）
-    try:
-        display_saved_data(notion_helper, search_query, sort_by, sort_order == "ascending")
-    except Exception as e:
-        st.error(f"保存済みデータの表示中にエラーが発生しました: {str(e)}")
-        logger.error(f"Error displaying saved data: {str(e)}")
+                            st.error(f"❌ Notionへの保存中にエラーが発生しました: {str(e)}")
+                            logger.error(f"Error saving to Notion: {str(e)}")
 
+# サイドバーの設定と保存済みデータの準備
+try:
+    notion_helper = get_notion_helper()
+    search_query, sort_by, sort_order = setup_sidebar()
+except Exception as e:
+    st.sidebar.error(f"データの読み込みに失敗しました: {str(e)}")
+    logger.error(f"Error loading saved data: {str(e)}")
+
+# Main application logic
+# Step 1: Video Input
+with st.expander("Step 1: Video Input",
+                 expanded=st.session_state.current_step == 1):
+    render_step_header(1)
+
+    youtube_url = st.text_input(
+        "YouTube URL",
+        placeholder="https://www.youtube.com/watch?v=...",
+        help="分析したいYouTube動画のURLを入力してください")
+
+    # Only fetch when the URL changes; st.rerun() below would otherwise loop
+    if youtube_url and youtube_url != st.session_state.youtube_url:
+        try:
+            video_url = canonical_video_url(youtube_url)
+            previous = st.session_state.video_info
+            new_video = not previous or previous['video_url'] != video_url
+            if new_video:
+                # Jobs still running for the previous video must never
+                # deliver into this one
+                cancel_all_jobs()
+            video_info = fetch_video_info(video_url)
+            if previous and new_video:
+                # A different video: everything derived from the old one is stale
+                for key in VIDEO_RESULT_KEYS:
+                    st.session_state[key] = SESSION_DEFAULTS[key]
+            st.session_state.video_info = video_info
+            st.session_state.youtube_url = youtube_url
+            st.session_state.current_step = 2
+            update_step_progress('video_info')
+            st.rerun()
+        except Exception as e:
+            st.error(f"動画情報の取得に失敗しました: {str(e)}")
+            logger.error(f"Error in video info retrieval: {str(e)}")
+            st.stop()
+
+# Step 2: Content Overview
+with st.expander("Step 2: Content Overview",
+                 expanded=st.session_state.current_step == 2):
+    render_step_header(2)
+    if st.session_state.video_info:
+        video_info = st.session_state.video_info
+
+        st.html(VIDEO_CARD_TEMPLATE.format_map(video_info))
+
+        if not st.session_state.transcript:
+            st.html(PROCESS_STEP_HTML)
+
+            try:
+                transcript = fetch_transcript(video_info['video_url'])
+                st.session_state.transcript = transcript
+                # Hash once here; downstream caches key on the digest
+                st.session_state.transcript_hash = hashlib.sha1(
+                    transcript.encode('utf-8')).hexdigest()
+                st.session_state.current_step = 3
+                update_step_progress('transcript')
+                st.rerun()
+            except Exception as e:
+                st.error(f"文字起こしの生成に失敗しました: {str(e)}")
+                logger.error(
+                    f"Error in transcript generation: {str(e)}")
+                st.stop()
+
+# Step 3: Content Analysis
+with st.expander("Step 3: Content Analysis",
+                 expanded=st.session_state.current_step == 3):
+    render_step_header(3)
+    render_content_analysis()
+
+# 保存済みデータの表示（最下部）
+try:
+    display_saved_data(notion_helper, search_query, sort_by, sort_order == "ascending")
 except Exception as e:
-    st.error(f"初期化エラー: {str(e)}")
-    logger.error(f"Initialization error: {str(e)}")
+    st.error(f"保存済みデータの表示中にエラーが発生しました: {str(e)}")
+    logger.error(f"Error displaying saved data: {str(e)}")
+
+# Poll the jobs this run is waiting on from a timed fragment; the app reruns
+# once, when one of them finishes, instead of blocking here in a rerun loop.
+# No done() filter: a job that finished after its tab checked it still needs
+# that rerun, which the first tick then triggers at once
+if awaited_job_names:
+    poll_background_jobs(tuple(sorted(awaited_job_names)))
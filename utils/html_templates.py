@@ -0,0 +1,158 @@
+# Markup for main.py, emitted with st.html so the frontend skips the
+# markdown parser. Streamlit re-executes the main script on every rerun, so
+# these live in an imported module where they are built only once.
+
+HEADER_HTML = '''
+<div class="app-header">
+    <div class="app-title">YouTube InsightMap</div>
+    <div class="app-subtitle">Content Knowledge Visualization</div>
+</div>
+'''
+
+FEATURE_HTML = '''
+<div class="glass-container feature-container">
+    <h4 class="section-header" style="margin-top: 0;">🎯 Advanced Content Analysis</h4>
+    <div class="feature-grid">
+        <div class="feature-card">
+            <div class="feature-icon">📝</div>
+            <h5 class="feature-title">文字起こし</h5>
+        </div>
+        <div class="feature-card">
+            <div class="feature-icon">🤖</div>
+            <h5 class="feature-title">要約</h5>
+        </div>
+        <div class="feature-card">
+            <div class="feature-icon">🔄</div>
+            <h5 class="feature-title">マップ化</h5>
+        </div>
+    </div>
+</div>
+'''
+
+# Header and feature grid sit back to back in the main area; one element
+APP_INTRO_HTML = HEADER_HTML + FEATURE_HTML
+
+PROCESS_STEP_HTML = '''
+<div class="process-step">
+    <div class="step-content">文字起こしを生成します</div>
+</div>
+'''
+
+# Step 2 video card; filled with str.format_map from the video_info dict
+VIDEO_CARD_TEMPLATE = '''<div class="glass-container video-info">
+    <div class="video-grid">
+        <div class="video-thumbnail">
+            <img src="{thumbnail_url}" alt="Video thumbnail" style="width: 100%; border-radius: 8px;">
+        </div>
+        <div class="video-details">
+            <h2 class="video-title">{title}</h2>
+            <div class="video-stats">
+                <span class="stat-badge">👤 {channel_title}</span>
+                <span class="stat-badge">⏱️ {duration}</span>
+                <span class="stat-badge">👁️ {view_count}回視聴</span>
+            </div>
+            <p class="video-date">📅 投稿日: {published_at}</p>
+        </div>
+    </div>
+</div>'''
+
+PROGRESS_MESSAGE_TEMPLATE = '<div class="progress-message">{icon} <span>{text}</span></div>'
+
+
+# (title, emoji, description) for each processing step
+STEPS = {
+    1: ("Video Input", "🎥", "分析したいYouTube動画のURLを入力してください"),
+    2: ("Content Overview", "📊", "動画の基本情報と文字起こしを表示します"),
+    3: ("Content Analysis", "🔍", "文字起こし、要約、マインドマップを生成します"),
+}
+
+STEP_STATUSES = ("", "active", "completed")
+
+
+STEP_HEADER_TEMPLATE = '''<div class="step-header {status}">
+    <div class="step-content">
+        <div class="step-title">{emoji} {title}</div>{description}
+    </div>
+</div>'''
+
+STEP_DESCRIPTION_TEMPLATE = '<div class="step-description">{}</div>'
+
+
+def build_step_header_html(status, title, emoji, description=""):
+    """Build the markup for a single step header"""
+    return STEP_HEADER_TEMPLATE.format(
+        status=status,
+        emoji=emoji,
+        title=title,
+        description=(STEP_DESCRIPTION_TEMPLATE.format(description)
+                     if description else "")
+    )
+
+
+# Every (step, status) combination rendered up front; lookups are a dict index
+STEP_HEADER_HTML = {
+    (step_number, status): build_step_header_html(status, *STEPS[step_number])
+    for step_number in STEPS
+    for status in STEP_STATUSES
+}
+
+
+# Summary point cards; filled with str.format per point
+POINT_CARD_TEMPLATE = '''<div class="summary-card">
+    <div class="importance-{importance_class}">
+        {emoji} <strong>ポイント{number}: {title}</strong>
+    </div>
+    <p>{content}</p>{supplementary}
+</div>'''
+
+SUPPLEMENTARY_TEMPLATE = '<p class="supplementary-info">{}</p>'
+
+KEYWORD_CARD_TEMPLATE = '''<div class="keyword-card">
+    <strong>{term}</strong>: {description}{related}
+</div>'''
+
+RELATED_TERMS_TEMPLATE = '<div class="related-terms">関連用語: {}</div>'
+
+QUALITY_SECTION_TEMPLATE = '''<div class="quality-score-section">
+<h3>要約品質スコア</h3>
+<div class="quality-score-container">
+{}
+</div>
+</div>'''
+
+# One quality score row, filled with str.format_map
+SCORE_ITEM_TEMPLATE = '''<div class="score-item">
+        <div class="score-header">
+            <div class="score-title">
+                {indicator} {label}
+                <div class="score-range score-{score_class}">
+                    {score:.1f}/10
+                </div>
+            </div>
+        </div>
+        <div class="score-description">{description}</div>
+        <div class="score-bar">
+            <div class="score-fill {score_class}" style="width: {width}%;"></div>
+        </div>
+    </div>'''
+
+# (indicator, css class) indexed by the integer part of a 0-10 quality score:
+# below 5 is low, 5-6 medium, 7 and above high
+SCORE_INDICATORS = (
+    (("❌", "low"),) * 5 +
+    (("⚠️", "medium"),) * 2 +
+    (("✅", "high"),) * 4
+)
+
+# (css class, emoji) indexed by an importance clamped to 0-5:
+# below 2 is low, 2-3 medium, 4 and above high
+IMPORTANCE_TIERS = (
+    (("low", "ℹ️"),) * 2 +
+    (("medium", "⭐"),) * 2 +
+    (("high", "🔥"),) * 2
+)
+
+
+def importance_tier(importance):
+    """Return the (css class, emoji) pair for an importance value"""
+    return IMPORTANCE_TIERS[max(0, min(importance, 5))]
@@ -7,13 +7,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class MindMapGenerator:
-    def __init__(self):
-        self._cache = {}
-
     def _create_mermaid_mindmap(self, data: Dict) -> str:
         """Generate Mermaid mindmap syntax with proper escaping and validation"""
         try:
-            logger.debug(f"Starting mindmap creation with data structure: {list(data.keys())}")
+            logger.debug("Starting mindmap creation with data structure: %s", list(data))
             lines = ["mindmap"]
             
             # Root node from video overview
@@ -21,7 +18,7 @@ class MindMapGenerator:
             if len(overview) > 50:
                 overview = overview[:47] + "..."
             lines.append(f"  root[{overview}]")
-            logger.debug(f"Added root node: {overview}")
+            logger.debug("Added root node: %s", overview)
             
             # Process points as primary branches
             points = data.get("ポイント", [])
@@ -29,7 +26,7 @@ class MindMapGenerator:
                 logger.warning("No points found in data")
                 return self._create_fallback_mindmap()
                 
-            logger.debug(f"Processing {len(points)} points")
+            logger.debug("Processing %d points", len(points))
             for i, point in enumerate(points, 1):
                 if not isinstance(point, dict):
                     logger.error(f"Invalid point structure at index {i}")
@@ -73,7 +70,7 @@ class MindMapGenerator:
                     lines.append(f"      c.1[{conclusion}]")
             
             mindmap = "\n".join(lines)
-            logger.debug(f"Generated mindmap structure:\n{mindmap}")
+            logger.debug("Generated mindmap structure:\n%s", mindmap)
             return mindmap
             
         except Exception as e:
@@ -112,14 +109,11 @@ class MindMapGenerator:
     def _validate_json_structure(self, data: Dict) -> bool:
         """Validate the JSON structure with enhanced validation and logging"""
         try:
-            # Log input data structure
-            logger.debug(f"Validating data structure: {type(data)}")
-            logger.debug(f"Available keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-            
             # Basic type validation
             if not isinstance(data, dict):
                 logger.error(f"Invalid data type: expected dict, got {type(data)}")
                 return False
+            logger.debug("Validating data structure with keys: %s", list(data))
             
             # Required keys validation with content length check
             required_keys = ["動画の概要", "ポイント", "結論"]
@@ -181,16 +175,16 @@ class MindMapGenerator:
         }
         
         for field, (expected_type, min_val, max_val) in required_fields.items():
-            value = point.get(field)
             if field not in point:
                 logger.error(f"Point {index} missing required field: {field}")
                 return False
+            value = point[field]
                 
             if not isinstance(value, expected_type):
                 logger.error(f"Point {index} field {field} has wrong type: expected {expected_type}, got {type(value)}")
                 return False
                 
-            if expected_type == str and (len(value.strip()) < min_val or len(value.strip()) > max_val):
+            if expected_type == str and not min_val <= len(value.strip()) <= max_val:
                 logger.error(f"Point {index} field {field} length out of range: {len(value)} not in [{min_val}, {max_val}]")
                 return False
                 
@@ -209,14 +203,6 @@ class MindMapGenerator:
 
             logger.info(f"Generating mindmap for text of length: {len(text)}")
             
-            # Check cache with reliable key generation
-            cache_key = hash(f"{text}_{self.__class__.__name__}")
-            if cache_key in self._cache:
-                logger.info("キャッシュからマインドマップを取得しました")
-                cached_content = self._cache[cache_key]
-                logger.debug(f"Cached mindmap length: {len(cached_content)}")
-                return cached_content, True
-
             # Parse and validate JSON
             try:
                 logger.debug("Attempting to parse JSON data")
@@ -225,7 +211,8 @@ class MindMapGenerator:
                 
                 if not self._validate_json_structure(data):
                     logger.warning("Invalid JSON structure detected, using fallback structure")
-                    logger.debug(f"Received data structure: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
+                    logger.debug("Received data structure: %s",
+                                 list(data) if isinstance(data, dict) else 'Not a dict')
                     data = {
                         "動画の概要": "コンテンツの要約",
                         "ポイント": [
@@ -253,10 +240,8 @@ class MindMapGenerator:
             # Generate mindmap with validated data
             mermaid_syntax = self._create_mermaid_mindmap(data)
             
-            # Cache only valid results
             if mermaid_syntax and mermaid_syntax.count('\n') > 2:
-                self._cache[cache_key] = mermaid_syntax
-                logger.info("新しいマインドマップを生成してキャッシュしました")
+                logger.info("新しいマインドマップを生成しました")
                 return mermaid_syntax, True
             
             logger.warning("生成されたマインドマップが無効です")
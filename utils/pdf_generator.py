@@ -46,7 +46,7 @@ class PDFGenerator:
                         logger.info(f"日本語フォントを正常に設定しました: {font_path}")
                         break
                 except Exception as e:
-                    logger.debug(f"Font path {font_path_pattern} not available: {str(e)}")
+                    logger.debug("Font path %s not available: %s", font_path_pattern, e)
                     continue
             
             if not font_found:
@@ -1,7 +1,7 @@
 import os
 import json
 import logging
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Iterator
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api.formatters import TextFormatter
 import google.generativeai as genai
@@ -13,9 +13,29 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TextProcessor:
+    # Video ID patterns, compiled once instead of on every lookup
+    VIDEO_ID_PATTERNS = tuple(re.compile(pattern) for pattern in (
+        r'(?:v=|\/)([0-9A-Za-z_-]{11})',
+        r'(?:embed\/)([0-9A-Za-z_-]{11})',
+        r'(?:watch\?v=)([0-9A-Za-z_-]{11})'
+    ))
+
+    # Scoring weights per summary style
+    QUALITY_WEIGHTS = {
+        "detailed": {
+            "構造の完全性": 0.3,
+            "情報量": 0.4,
+            "簡潔性": 0.3
+        },
+        "overview": {
+            "構造の完全性": 0.3,
+            "情報量": 0.3,
+            "簡潔性": 0.4
+        }
+    }
+
     def __init__(self):
         self._setup_gemini()
-        self._cache = {}
 
     def _setup_gemini(self):
         """Initialize Gemini API with the provided key"""
@@ -40,13 +60,8 @@ class TextProcessor:
 
     def _extract_video_id(self, url: str) -> str:
         """Extract video ID from YouTube URL"""
-        patterns = [
-            r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-            r'(?:embed\/)([0-9A-Za-z_-]{11})',
-            r'(?:watch\?v=)([0-9A-Za-z_-]{11})'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in self.VIDEO_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         raise ValueError("Invalid YouTube URL")
@@ -59,10 +74,6 @@ class TextProcessor:
                 logger.warning(f"Invalid style '{style}', defaulting to 'overview'")
                 style = "overview"
 
-            cache_key = f"{hash(text)}_{style}"
-            if cache_key in self._cache:
-                return self._cache[cache_key]
-
             prompt = self._create_summary_prompt(text, style)
             response = self.model.generate_content(prompt)
             
@@ -111,17 +122,50 @@ class TextProcessor:
                 raise ValueError(f"JSON処理中に予期せぬエラーが発生しました: {str(e)}")
 
             # Evaluate summary quality
-            quality_scores = self._evaluate_summary_quality(summary, text, style)
-            
-            # Cache the result
-            result = (summary, quality_scores)
-            self._cache[cache_key] = result
-            return result
+            quality_scores = self._evaluate_summary_quality(json_data, style)
+            return summary, quality_scores
 
         except Exception as e:
             logger.error(f"Summary generation error: {str(e)}")
             raise ValueError(f"要約の生成に失敗しました: {str(e)}")
 
+    def proofread_text_stream(self, text: str) -> Iterator[str]:
+        """Yield the proofread text chunk by chunk as the model produces it"""
+        try:
+            has_text = False
+            response = self.model.generate_content(
+                self._create_proofread_prompt(text), stream=True)
+            for chunk in response:
+                if chunk.text:
+                    has_text = True
+                    yield chunk.text
+            if not has_text:
+                raise ValueError("空の応答が返されました")
+        except Exception as e:
+            logger.error(f"Proofreading error: {str(e)}")
+            raise ValueError(f"文章の校正に失敗しました: {str(e)}")
+
+    def _create_proofread_prompt(self, text: str) -> str:
+        """Create a prompt for proofreading a transcript"""
+        return f'''
+以下のテキストを高品質な文章に校正してください。以下の観点から包括的に改善を行ってください：
+
+1. 文章の論理構造と文脈の一貫性を整理
+2. 読点・句点の適切な配置による読みやすさの向上
+3. 漢字とかなの使い分けの最適化
+4. 文体の統一性と自然な文章の流れの確保
+5. 冗長な表現の簡潔化と明確な意味伝達
+6. 専門用語の適切な使用と必要に応じた説明の追加
+7. 段落構成の改善による理解しやすい文章構造
+8. 話し言葉から書き言葉への適切な変換
+
+入力テキスト:
+{text}
+
+上記のテキストを、論理的で読みやすい自然な日本語に校正してください。
+文章全体の一貫性と文脈を維持しながら、より洗練された表現に改善してください。
+'''
+
     def _create_summary_prompt(self, text: str, style: str) -> str:
         """Create a prompt for summary generation based on style"""
         base_prompt = f"""
@@ -171,24 +215,11 @@ class TextProcessor:
 - 重要度は主要なポイントを中心に評価
 """
 
-    def _evaluate_summary_quality(self, summary: str, original_text: str, style: str) -> Dict[str, float]:
+    def _evaluate_summary_quality(self, summary_data: Dict[str, Any], style: str) -> Dict[str, float]:
         """Evaluate the quality of the generated summary"""
         try:
-            summary_data = json.loads(summary)
-            
             # Base scoring weights
-            weights = {
-                "detailed": {
-                    "構造の完全性": 0.3,
-                    "情報量": 0.4,
-                    "簡潔性": 0.3
-                },
-                "overview": {
-                    "構造の完全性": 0.3,
-                    "情報量": 0.3,
-                    "簡潔性": 0.4
-                }
-            }[style]
+            weights = self.QUALITY_WEIGHTS[style]
 
             # Evaluate structure completeness
             structure_score = self._evaluate_structure(summary_data)
@@ -10,12 +10,18 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class YouTubeHelper:
+    # Video ID patterns, compiled once instead of on every lookup
+    VIDEO_ID_PATTERNS = tuple(re.compile(pattern) for pattern in (
+        r"(?:v=|\/)([0-9A-Za-z_-]{11})",
+        r"(?:embed\/)([0-9A-Za-z_-]{11})",
+        r"(?:watch\?v=)([0-9A-Za-z_-]{11})"
+    ))
+
     def __init__(self):
         api_key = os.environ.get('YOUTUBE_API_KEY')
         if not api_key:
             raise ValueError("YouTube API key is not set in environment variables")
         self.youtube = build('youtube', 'v3', developerKey=api_key)
-        self._cache = {}
 
     def extract_video_id(self, url):
         """URLからビデオIDを抽出"""
@@ -23,13 +29,8 @@ class YouTubeHelper:
             video_id = url.split("/")[-1].split("?")[0]
         else:
             video_id = None
-            patterns = [
-                r"(?:v=|\/)([0-9A-Za-z_-]{11}).*",
-                r"(?:embed\/)([0-9A-Za-z_-]{11})",
-                r"(?:watch\?v=)([0-9A-Za-z_-]{11})"
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, url)
+            for pattern in self.VIDEO_ID_PATTERNS:
+                match = pattern.search(url)
                 if match:
                     video_id = match.group(1)
                     break
@@ -42,11 +43,6 @@ class YouTubeHelper:
         """動画の詳細情報を取得"""
         try:
             video_id = self.extract_video_id(url)
-            
-            # Check cache first
-            cache_key = f"video_info_{video_id}"
-            if cache_key in self._cache:
-                return self._cache[cache_key]
 
             # Get video and channel details
             video_request = self.youtube.videos().list(
@@ -103,8 +99,6 @@ class YouTubeHelper:
                 'subscriber_count': format_count(channel_statistics.get('subscriberCount', '0')),
             }
 
-            # Cache the result
-            self._cache[cache_key] = video_info
             return video_info
 
         except Exception as e: